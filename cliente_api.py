@@ -1,8 +1,19 @@
 import requests
 import urllib.parse
 import json
+import logging
+import msgspec
+import orjson
 import os
-from typing import Dict, List, Any, Optional
+import shutil
+import string
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # --- CONFIGURACIÓN CRÍTICA ---
 # ¡IMPORTANTE! Reemplaza esta URL con la URL REAL de tu servicio FastAPI en Render.com.
@@ -10,155 +21,339 @@ from typing import Dict, List, Any, Optional
 BASE_URL_FASTAPI = "https://gestor-audiencias-api.onrender.com" 
 # Por ejemplo: https://gestor-audiencias-api.onrender.com
 
-# --- FUNCIONES PARA INTERACTUAR CON TU API ---
+logger = logging.getLogger(__name__)
 
-def crear_archivo_excel_en_api(nombre_archivo: str) -> Dict[str, Any]:
+# URLs de los endpoints, construidas una sola vez al importar el módulo
+_CREATE_URL = f"{BASE_URL_FASTAPI}/crear_archivo/"
+_AUDIENCIAS_URL = f"{BASE_URL_FASTAPI}/audiencias/"
+_AUDIENCIAS_BULK_URL = f"{BASE_URL_FASTAPI}/audiencias/bulk/"
+_ARCHIVOS_URL = f"{BASE_URL_FASTAPI}/archivos/"
+_EXPORT_BASE = f"{BASE_URL_FASTAPI}/exportar/"
+_DOWNLOAD_BASE = f"{BASE_URL_FASTAPI}/descargar/"
+_DEBUG_URL = f"{BASE_URL_FASTAPI}/debug_archivos/"
+
+# Caracteres que no necesitan codificarse en un segmento de URL
+_SAFE = frozenset(string.ascii_letters + string.digits + "._-")
+
+def _encode(nombre: str) -> str:
     """
-    Llama al endpoint /crear_archivo/ de tu FastAPI para crear una copia de la plantilla.
+    Codifica el nombre para la URL solo si contiene caracteres no seguros.
     """
-    # Asegúrate de codificar el nombre del archivo para que sea seguro en la URL
-    nombre_codificado = urllib.parse.quote_plus(nombre_archivo)
-    url = f"{BASE_URL_FASTAPI}/crear_archivo/?nombre={nombre_codificado}"
+    return nombre if all(c in _SAFE for c in nombre) else urllib.parse.quote_plus(nombre)
 
-    print(f"DEBUG: Llamando a la URL de creación de archivo: {url}") # Para depuración
-    
-    response = requests.post(url, headers={"Content-Type": "application/json"})
+# Tamaño de bloque para descargas: bloques de 1 MiB reducen las lecturas del
+# socket y las escrituras en disco frente al bloque pequeño por defecto
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Descargas de hasta este tamaño (según Content-Length) se leen completas y se
+# escriben con un solo write(), sin pasar por el bucle de streaming
+SMALL_DOWNLOAD_LIMIT = 4 * 1024 * 1024
+
+# Timeout por llamada (conexión, lectura) en segundos: sin él un socket colgado bloquea para siempre
+REQUEST_TIMEOUT = (5, 60)
+
+# --- SESIÓN HTTP COMPARTIDA ---
+# Una sola sesión reutiliza las conexiones (keep-alive), evitando un nuevo
+# handshake TCP+TLS contra Render en cada llamada.
+# Los reintentos con backoff exponencial absorben los 502/503/504 que Render
+# devuelve mientras el servicio despierta (cold start). Con raise_on_status=False
+# el último intento devuelve la respuesta y raise_for_status() informa el error.
+# Solo los GET se repiten ante un 5xx o un timeout de lectura: un POST puede
+# haberse aplicado ya en el servidor (p. ej. una audiencia guardada) y repetirlo
+# daría un falso "Ya existe una audiencia" o dos escrituras simultáneas del mismo
+# Excel. Los errores de conexión sí se reintentan para todos los métodos, porque
+# en ese caso la petición nunca llegó al servidor.
+_SESSION = requests.Session()
+# requests ya envía por defecto "Accept-Encoding: gzip, deflate" (más br si brotli
+# está instalado) y urllib3 descomprime de forma transparente antes de _json()
+_SESSION.headers.update({"Content-Type": "application/json"})
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=4,
+            connect=3,
+            read=3,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        ),
+    ),
+)
+
+def close_session() -> None:
+    """
+    Cierra la sesión HTTP compartida y libera sus conexiones.
+    """
+    _SESSION.close()
+
+def _json(response: requests.Response) -> Any:
+    """
+    Decodifica el cuerpo JSON de la respuesta con orjson, directamente desde los bytes.
+    orjson.JSONDecodeError hereda de json.JSONDecodeError, así que los
+    manejadores de error existentes siguen funcionando.
+    """
+    return orjson.loads(response.content)
+
+def mostrar_error_http(response: Any, operacion: str, http_err: Exception) -> None:
+    """
+    Imprime el error HTTP y el detalle que devuelve la API. Sirve tanto para
+    respuestas de requests como de httpx (cliente_api_async). El cuerpo de
+    error se decodifica una sola vez.
+    """
+    print(f"ERROR HTTP al {operacion}: {http_err}")
+    try:
+        error_detail = orjson.loads(response.content).get('detail', response.text)
+        print(f"Detalle del error desde API: {error_detail}")
+    except (orjson.JSONDecodeError, AttributeError):
+        # AttributeError: el cuerpo es JSON pero no un objeto (p. ej. una lista)
+        print(f"Respuesta del API (no JSON): {response.text}")
+
+def _raise_with_detail(response: requests.Response, operacion: str) -> None:
+    """
+    Lanza HTTPError si la respuesta es un error, imprimiendo antes el detalle
+    que devuelve la API.
+    """
     try:
         response.raise_for_status()  # Lanza una excepción para errores HTTP (4xx o 5xx)
-        return response.json()
     except requests.exceptions.HTTPError as http_err:
-        print(f"ERROR HTTP al crear archivo: {http_err}")
-        try:
-            error_detail = response.json().get('detail', response.text)
-            print(f"Detalle del error desde API: {error_detail}")
-        except json.JSONDecodeError:
-            print(f"Respuesta del API (no JSON): {response.text}")
-        raise
-    except Exception as err:
-        print(f"ERROR general al crear archivo: {err}")
+        mostrar_error_http(response, operacion, http_err)
         raise
 
-def guardar_audiencia_en_api(datos_audiencia: Dict[str, Any]) -> Dict[str, Any]:
+# --- ESQUEMA DE AUDIENCIA ---
+# msgspec genera un codificador JSON especializado para este esquema fijo y
+# valida los tipos antes de gastar una petición en datos mal formados. Los tipos
+# aceptan lo mismo que el servidor: radicado numérico y observaciones nulas. Las
+# claves que no están en el esquema se descartan (el servidor las ignora).
+class Audiencia(msgspec.Struct):
+    radicado: Union[str, int]
+    tipo_audiencia: str
+    fecha: str
+    hora: str
+    juzgado: str
+    se_realizo: str
+    nombre_archivo: str
+    motivos: list[str] = []
+    observaciones: Optional[str] = ""
+
+_AUDIENCIA_ENCODER = msgspec.json.Encoder()
+
+# --- CACHÉ DEL LISTADO DE ARCHIVOS ---
+# El listado cambia poco: se reutiliza durante LIST_TTL segundos para evitar
+# idas y vueltas repetidas a Render. Crear o exportar un archivo lo invalida.
+# "generacion" aumenta con cada invalidación: una respuesta pedida antes de
+# invalidar no se guarda, aunque llegue después (listar corre en otro hilo).
+LIST_TTL = 5.0
+_LIST_CACHE: Dict[str, Any] = {"ts": 0.0, "data": None, "generacion": 0}
+_LIST_CACHE_LOCK = threading.Lock()
+
+def _invalidar_cache_listado() -> None:
+    """
+    Fuerza a que la próxima llamada a listar_archivos_en_api consulte la API.
+    """
+    with _LIST_CACHE_LOCK:
+        _LIST_CACHE["ts"] = 0.0
+        _LIST_CACHE["data"] = None
+        _LIST_CACHE["generacion"] += 1
+
+# --- FUNCIONES PARA INTERACTUAR CON TU API ---
+
+def crear_archivo_excel_en_api(nombre_archivo: str) -> Dict[str, Any]:
+    """
+    Llama al endpoint /crear_archivo/ de tu FastAPI para crear una copia de la plantilla.
+    """
+    url = _CREATE_URL
+
+    logger.debug("Llamando a la URL de creación de archivo: %s (nombre=%s)", url, nombre_archivo)
+    
+    # requests construye y codifica la query string a partir de `params`
+    response = _SESSION.post(url, params={"nombre": nombre_archivo}, timeout=REQUEST_TIMEOUT)
+    _raise_with_detail(response, "crear archivo")
+    _invalidar_cache_listado()
+    return _json(response)
+
+def guardar_audiencia_en_api(datos_audiencia: Union[Audiencia, Dict[str, Any]]) -> Dict[str, Any]:
     """
     Llama al endpoint /audiencias/ de tu FastAPI para guardar una audiencia.
+    Acepta un `Audiencia` o un diccionario con los mismos campos; el diccionario
+    se valida contra el esquema (msgspec.ValidationError si no cumple).
     """
-    url = f"{BASE_URL_FASTAPI}/audiencias/"
+    url = _AUDIENCIAS_URL
     
-    print(f"DEBUG: Llamando a la URL para guardar audiencia: {url}") # Para depuración
-    print(f"DEBUG: Datos enviados: {datos_audiencia}") # Para depuración
+    if not isinstance(datos_audiencia, Audiencia):
+        datos_audiencia = msgspec.convert(datos_audiencia, Audiencia)
 
-    response = requests.post(url, json=datos_audiencia, headers={"Content-Type": "application/json"})
-    try:
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as http_err:
-        print(f"ERROR HTTP al guardar audiencia: {http_err}")
-        try:
-            error_detail = response.json().get('detail', response.text)
-            print(f"Detalle del error desde API: {error_detail}")
-        except json.JSONDecodeError:
-            print(f"Respuesta del API (no JSON): {response.text}")
-        raise
-    except Exception as err:
-        print(f"ERROR general al guardar audiencia: {err}")
-        raise
+    logger.debug("Llamando a la URL para guardar audiencia: %s con payload %r", url, datos_audiencia)
+
+    response = _SESSION.post(url, data=_AUDIENCIA_ENCODER.encode(datos_audiencia), timeout=REQUEST_TIMEOUT)
+    _raise_with_detail(response, "guardar audiencia")
+    # El servidor responde 204 sin cuerpo; versiones anteriores devolvían {"ok": true}
+    if response.status_code == 204:
+        return {"ok": True}
+    return _json(response)
+
+def guardar_audiencias_en_api(audiencias: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Llama al endpoint /audiencias/bulk/ de tu FastAPI para guardar varias audiencias
+    en una sola petición. El servidor valida el lote completo antes de escribir:
+    un error de validación (400) significa que no se guardó ninguna. Un error al
+    escribir (500) puede llegar cuando algunos archivos ya se guardaron; el
+    detalle del error los lista en "archivos_guardados".
+    Si el servidor aún no tiene ese endpoint, las guarda una por una con
+    guardar_audiencia_en_api y no lanza excepción por los fallos: devuelve el
+    resultado de cada audiencia en su posición, con {"ok": False, "detail": ...}
+    para las que no se pudieron guardar (ver _guardar_audiencias_en_paralelo).
+    """
+    url = _AUDIENCIAS_BULK_URL
+
+    logger.debug("Llamando a la URL para guardar %d audiencias: %s", len(audiencias), url)
 
-def listar_archivos_en_api() -> List[Any]:
+    response = _SESSION.post(url, data=orjson.dumps(audiencias), timeout=REQUEST_TIMEOUT)
+    if response.status_code in (404, 405):
+        logger.debug("Endpoint %s no disponible, se guardan las audiencias una por una", url)
+        return _guardar_audiencias_en_paralelo(audiencias)
+    _raise_with_detail(response, "guardar audiencias")
+    return _json(response)
+
+def _guardar_audiencias_en_paralelo(audiencias: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Guarda las audiencias con una petición por audiencia, en paralelo entre archivos
+    distintos. Las de un mismo archivo van en serie: el servidor reescribe el Excel
+    completo en cada guardado y dos escrituras simultáneas perderían datos.
+    Cada guardado es independiente, así que un fallo no detiene a los demás: el
+    resultado de cada audiencia queda en su posición, con {"ok": False, "detail": ...}
+    para las que no se pudieron guardar.
+    """
+    indices_por_archivo: Dict[Any, List[int]] = {}
+    for i, audiencia in enumerate(audiencias):
+        indices_por_archivo.setdefault(audiencia.get("nombre_archivo"), []).append(i)
+
+    resultados: List[Dict[str, Any]] = [{} for _ in audiencias]
+
+    def guardar_grupo(indices: List[int]) -> None:
+        for i in indices:
+            try:
+                resultados[i] = guardar_audiencia_en_api(audiencias[i])
+            except Exception as e:
+                resultados[i] = {"ok": False, "detail": str(e)}
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        # Al salir del with se esperan todos los grupos
+        for indices in indices_por_archivo.values():
+            executor.submit(guardar_grupo, indices)
+    return resultados
+
+def listar_archivos_en_api(force_refresh: bool = False) -> List[Any]:
     """
     Llama al endpoint /archivos/ de tu FastAPI para listar los archivos existentes.
+    Devuelve el listado en caché si tiene menos de LIST_TTL segundos, salvo
+    que se pida `force_refresh=True`.
     """
-    url = f"{BASE_URL_FASTAPI}/archivos/"
+    with _LIST_CACHE_LOCK:
+        if (not force_refresh and _LIST_CACHE["data"] is not None
+                and time.monotonic() - _LIST_CACHE["ts"] < LIST_TTL):
+            return list(_LIST_CACHE["data"])  # Copia: quien llama puede modificarla
+        generacion = _LIST_CACHE["generacion"]
+
+    url = _ARCHIVOS_URL
     
-    print(f"DEBUG: Llamando a la URL para listar archivos: {url}") # Para depuración
+    logger.debug("Llamando a la URL para listar archivos: %s", url)
 
-    response = requests.get(url)
-    try:
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as http_err:
-        print(f"ERROR HTTP al listar archivos: {http_err}")
-        try:
-            error_detail = response.json().get('detail', response.text)
-            print(f"Detalle del error desde API: {error_detail}")
-        except json.JSONDecodeError:
-            print(f"Respuesta del API (no JSON): {response.text}")
-        raise
-    except Exception as err:
-        print(f"ERROR general al listar archivos: {err}")
-        raise
+    response = _SESSION.get(url, timeout=REQUEST_TIMEOUT)
+    _raise_with_detail(response, "listar archivos")
+    archivos = _json(response)
+    with _LIST_CACHE_LOCK:
+        if _LIST_CACHE["generacion"] == generacion:
+            _LIST_CACHE["data"] = archivos
+            _LIST_CACHE["ts"] = time.monotonic()
+    return list(archivos)
 
 def exportar_archivo_en_api(nombre_archivo: str) -> Dict[str, Any]:
     """
     Llama al endpoint /exportar/{nombre_archivo} de tu FastAPI para añadir firma.
     """
-    nombre_codificado = urllib.parse.quote_plus(nombre_archivo)
-    url = f"{BASE_URL_FASTAPI}/exportar/{nombre_codificado}"
+    url = _EXPORT_BASE + _encode(nombre_archivo)
     
-    print(f"DEBUG: Llamando a la URL para exportar archivo: {url}") # Para depuración
+    logger.debug("Llamando a la URL para exportar archivo: %s", url)
 
-    response = requests.post(url) # POST sin cuerpo para este endpoint
-    try:
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.HTTPError as http_err:
-        print(f"ERROR HTTP al exportar archivo: {http_err}")
-        try:
-            error_detail = response.json().get('detail', response.text)
-            print(f"Detalle del error desde API: {error_detail}")
-        except json.JSONDecodeError:
-            print(f"Respuesta del API (no JSON): {response.text}")
-        raise
-    except Exception as err:
-        print(f"ERROR general al exportar archivo: {err}")
-        raise
+    response = _SESSION.post(url, timeout=REQUEST_TIMEOUT) # POST sin cuerpo para este endpoint
+    _raise_with_detail(response, "exportar archivo")
+    _invalidar_cache_listado()
+    return _json(response)
 
-def descargar_archivo_desde_api(nombre_archivo: str, ruta_guardado: str) -> str:
+def descargar_archivo_desde_api(
+    nombre_archivo: str,
+    ruta_guardado: str,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE
+) -> str:
     """
     Llama al endpoint /descargar/{nombre_archivo} y guarda el archivo localmente.
+    `chunk_size` controla el tamaño de cada bloque leído y escrito en disco.
     """
-    nombre_codificado = urllib.parse.quote_plus(nombre_archivo)
-    url = f"{BASE_URL_FASTAPI}/descargar/{nombre_codificado}"
+    url = _DOWNLOAD_BASE + _encode(nombre_archivo)
     
-    print(f"DEBUG: Llamando a la URL para descargar archivo: {url}") # Para depuración
+    logger.debug("Llamando a la URL para descargar archivo: %s", url)
 
-    response: Optional[requests.Response] = None
+    # stream=True para descargar archivos grandes
+    response = _SESSION.get(url, stream=True, timeout=REQUEST_TIMEOUT)
+    _raise_with_detail(response, "descargar archivo")
     try:
-        response = requests.get(url, stream=True) # stream=True para descargar archivos grandes
-        response.raise_for_status()
-        
-        with open(ruta_guardado, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        content_length = int(response.headers.get("Content-Length", "0"))
+        if 0 < content_length <= SMALL_DOWNLOAD_LIMIT:
+            # Archivo pequeño: una sola lectura y una sola escritura
+            with open(ruta_guardado, 'wb') as f:
+                f.write(response.content)
+        else:
+            # Copia directa desde el socket de urllib3 al archivo, sin re-empaquetar cada bloque
+            response.raw.decode_content = True
+            with open(ruta_guardado, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=chunk_size)
         print(f"Archivo '{nombre_archivo}' descargado exitosamente en '{ruta_guardado}'")
         return ruta_guardado
-    except requests.exceptions.HTTPError as http_err:
-        print(f"ERROR HTTP al descargar archivo: {http_err}")
-        # Si es un 404, el detalle podría estar en el cuerpo si FastAPI lo devuelve como JSON
-        if response is not None and response.status_code == 404:
-            try:
-                error_detail = response.json().get('detail', response.text)
-                print(f"Detalle del error desde API (404): {error_detail}")
-            except json.JSONDecodeError:
-                print(f"Respuesta del API (no JSON): {response.text}")
-        raise
     except Exception as err:
         print(f"ERROR general al descargar archivo: {err}")
         raise
 
+def consultar_debug_archivos_en_api() -> Dict[str, Any]:
+    """
+    Llama al endpoint /debug_archivos/ de tu FastAPI para inspeccionar los archivos del servidor.
+    """
+    response_debug = _SESSION.get(_DEBUG_URL, timeout=REQUEST_TIMEOUT)
+    _raise_with_detail(response_debug, "consultar /debug_archivos/")
+    return _json(response_debug)
+
 # --- EJEMPLO DE USO (cómo podrías usar estas funciones) ---
 def main() -> None:
     """Función principal que ejecuta el ejemplo de uso."""
+    # Nivel de log configurable: LOG_LEVEL=DEBUG muestra las URLs y payloads enviados
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
     nombre_excel_nuevo = "mi_informe_de_prueba.xlsx"
 
-    # 1. Crear el archivo Excel (copia de la plantilla)
+    # 0. Consulta qué archivos ya existen para no repetir trabajo en el servidor
     try:
-        print("\n--- Intentando crear archivo Excel ---")
-        resultado_creacion = crear_archivo_excel_en_api(nombre_excel_nuevo)
-        print(f"Resultado de creación: {resultado_creacion}")
+        archivos_previos = {
+            a.get('nombre') if isinstance(a, dict) else a
+            for a in listar_archivos_en_api()
+        }
     except Exception as e:
-        print(f"No se pudo crear el archivo: {e}")
-        # Si esto falla, no tiene sentido continuar, porque el archivo no existe.
-        return
+        print(f"No se pudieron listar los archivos previos: {e}")
+        archivos_previos = set()
+
+    # 1. Crear el archivo Excel (copia de la plantilla), solo si aún no existe
+    if nombre_excel_nuevo in archivos_previos:
+        print(f"\n--- El archivo '{nombre_excel_nuevo}' ya existe; se omite la creación ---")
+    else:
+        try:
+            print("\n--- Intentando crear archivo Excel ---")
+            resultado_creacion = crear_archivo_excel_en_api(nombre_excel_nuevo)
+            print(f"Resultado de creación: {resultado_creacion}")
+        except Exception as e:
+            print(f"No se pudo crear el archivo: {e}")
+            # Si esto falla, no tiene sentido continuar, porque el archivo no existe.
+            return
 
     # 2. Guardar una audiencia en el archivo recién creado
     datos_audiencia_ejemplo: Dict[str, Any] = {
@@ -174,55 +369,71 @@ def main() -> None:
     # Asegúrate de pasar el nombre del archivo en el dict para guardar_audiencia_excel
     datos_audiencia_ejemplo["nombre_archivo"] = nombre_excel_nuevo
 
+    archivo_modificado = False
     try:
         print("\n--- Intentando guardar audiencia ---")
         resultado_guardado = guardar_audiencia_en_api(datos_audiencia_ejemplo)
         print(f"Resultado de guardado: {resultado_guardado}")
+        archivo_modificado = True
     except Exception as e:
         print(f"No se pudo guardar la audiencia: {e}")
 
-    # 3. Listar archivos existentes
-    try:
-        print("\n--- Listando archivos ---")
-        archivos_existentes = listar_archivos_en_api()
-        print(f"Archivos en el servidor: {archivos_existentes}")
-    except Exception as e:
-        print(f"No se pudieron listar los archivos: {e}")
+    # 3. Lanza en paralelo las llamadas independientes (listado y depuración)
+    # mientras la cadena exportar -> descargar sigue en el hilo principal.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        tareas = {
+            executor.submit(listar_archivos_en_api): "listar",
+            executor.submit(consultar_debug_archivos_en_api): "debug",
+        }
 
-    # 4. Exportar el archivo (añadir firma)
-    try:
-        print("\n--- Intentando exportar archivo ---")
-        resultado_exportacion = exportar_archivo_en_api(nombre_excel_nuevo)
-        print(f"Resultado de exportación: {resultado_exportacion}")
-        if "download_url" in resultado_exportacion:
-            print(f"URL de descarga generada: {resultado_exportacion['download_url']}")
-    except Exception as e:
-        print(f"No se pudo exportar el archivo: {e}")
+        # 4. Exportar el archivo (añadir firma). Se omite solo si el paso 2 no cambió
+        # el archivo y el servidor ya tiene una exportación suya; el nombre se toma
+        # del listado del servidor, que fecha las exportaciones con su propio reloj
+        prefijo_exportado = f"{Path(nombre_excel_nuevo).stem}_exportado_"
+        exportaciones_previas = sorted(
+            a for a in archivos_previos
+            if isinstance(a, str) and a.startswith(prefijo_exportado) and a.endswith(".xlsx")
+        )
+        if not archivo_modificado and exportaciones_previas:
+            print(f"\n--- '{exportaciones_previas[-1]}' ya está al día; se omite la exportación ---")
+        else:
+            try:
+                print("\n--- Intentando exportar archivo ---")
+                resultado_exportacion = exportar_archivo_en_api(nombre_excel_nuevo)
+                print(f"Resultado de exportación: {resultado_exportacion}")
+                if "download_url" in resultado_exportacion:
+                    print(f"URL de descarga generada: {resultado_exportacion['download_url']}")
+            except Exception as e:
+                print(f"No se pudo exportar el archivo: {e}")
 
-    # 5. Descargar el archivo exportado
-    ruta_para_guardar_localmente = f"./descargas/{nombre_excel_nuevo}"
-    os.makedirs("./descargas", exist_ok=True) # Asegura que la carpeta de descargas exista
-    try:
-        print("\n--- Intentando descargar archivo ---")
-        ruta_descargada = descargar_archivo_desde_api(nombre_excel_nuevo, ruta_para_guardar_localmente)
-        print(f"Archivo descargado en: {ruta_descargada}")
-    except Exception as e:
-        print(f"No se pudo descargar el archivo: {e}")
+        # 5. Descargar el archivo exportado
+        ruta_para_guardar_localmente = f"./descargas/{nombre_excel_nuevo}"
+        os.makedirs("./descargas", exist_ok=True) # Asegura que la carpeta de descargas exista
+        try:
+            print("\n--- Intentando descargar archivo ---")
+            ruta_descargada = descargar_archivo_desde_api(nombre_excel_nuevo, ruta_para_guardar_localmente)
+            print(f"Archivo descargado en: {ruta_descargada}")
+        except Exception as e:
+            print(f"No se pudo descargar el archivo: {e}")
 
-    # --- LLAMA A TU ENDPOINT DE DEPURACIÓN (MUY IMPORTANTE) ---
-    print("\n--- Llamando al endpoint de depuración de archivos ---")
-    print("¡COPIA LA RESPUESTA JSON DE ESTE ENDPOINT Y PÉGALA EN EL CHAT!")
-    print("Esto es CRÍTICO para saber si tu plantilla está en Render.com.")
-    try:
-        # Aquí puedes llamar al debug endpoint directamente
-        # En tu navegador sería: https://tu-url-de-fastapi-en-render.onrender.com/debug_archivos/
-        # Para llamarlo desde Python y ver el JSON:
-        debug_url = f"{BASE_URL_FASTAPI}/debug_archivos/"
-        response_debug = requests.get(debug_url)
-        response_debug.raise_for_status()
-        print(f"Respuesta de /debug_archivos/: {json.dumps(response_debug.json(), indent=2)}")
-    except Exception as e:
-        print(f"Error al llamar a /debug_archivos/: {e}")
+        # Recoge los resultados de las llamadas paralelas a medida que terminan
+        for tarea in as_completed(tareas):
+            if tareas[tarea] == "listar":
+                print("\n--- Listando archivos ---")
+                try:
+                    print(f"Archivos en el servidor: {tarea.result()}")
+                except Exception as e:
+                    print(f"No se pudieron listar los archivos: {e}")
+            else:
+                # --- ENDPOINT DE DEPURACIÓN (MUY IMPORTANTE) ---
+                # En tu navegador sería: https://tu-url-de-fastapi-en-render.onrender.com/debug_archivos/
+                print("\n--- Llamando al endpoint de depuración de archivos ---")
+                print("¡COPIA LA RESPUESTA JSON DE ESTE ENDPOINT Y PÉGALA EN EL CHAT!")
+                print("Esto es CRÍTICO para saber si tu plantilla está en Render.com.")
+                try:
+                    print(f"Respuesta de /debug_archivos/: {json.dumps(tarea.result(), indent=2)}")
+                except Exception as e:
+                    print(f"Error al llamar a /debug_archivos/: {e}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
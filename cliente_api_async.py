@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+import urllib.parse
+from typing import Dict, List, Any
+
+import httpx
+
+from cliente_api import BASE_URL_FASTAPI, DOWNLOAD_CHUNK_SIZE, REQUEST_TIMEOUT, mostrar_error_http
+
+# --- CLIENTE ASÍNCRONO (HTTP/2) ---
+# Con HTTP/2 varias peticiones viajan multiplexadas sobre una sola conexión TLS,
+# así que las llamadas concurrentes no esperan a que termine la anterior.
+
+def crear_cliente_async() -> httpx.AsyncClient:
+    """
+    Crea el cliente HTTP/2 compartido. Debe cerrarse con `await client.aclose()`
+    o usarse como `async with crear_cliente_async() as client:`.
+    """
+    return httpx.AsyncClient(
+        base_url=BASE_URL_FASTAPI,
+        http2=True,
+        # Mismos límites (conexión, lectura) que el cliente síncrono
+        timeout=httpx.Timeout(REQUEST_TIMEOUT[1], connect=REQUEST_TIMEOUT[0]),
+        limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+    )
+
+def _raise_with_detail(response: httpx.Response, operacion: str) -> None:
+    """
+    Versión para httpx de cliente_api._raise_with_detail: lanza HTTPStatusError
+    si la respuesta es un error, imprimiendo antes el detalle que devuelve la API.
+    """
+    try:
+        response.raise_for_status()
+    except httpx.HTTPStatusError as http_err:
+        mostrar_error_http(response, operacion, http_err)
+        raise
+
+async def crear_archivo_excel_en_api_async(client: httpx.AsyncClient, nombre_archivo: str) -> Dict[str, Any]:
+    """
+    Versión asíncrona de crear_archivo_excel_en_api.
+    """
+    response = await client.post("/crear_archivo/", params={"nombre": nombre_archivo})
+    _raise_with_detail(response, "crear archivo")
+    return response.json()
+
+async def guardar_audiencia_en_api_async(client: httpx.AsyncClient, datos_audiencia: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Versión asíncrona de guardar_audiencia_en_api.
+    """
+    response = await client.post("/audiencias/", json=datos_audiencia)
+    _raise_with_detail(response, "guardar audiencia")
+    if response.status_code == 204:
+        return {"ok": True}
+    return response.json()
+
+async def listar_archivos_en_api_async(client: httpx.AsyncClient) -> List[Any]:
+    """
+    Versión asíncrona de listar_archivos_en_api.
+    """
+    response = await client.get("/archivos/")
+    _raise_with_detail(response, "listar archivos")
+    return response.json()
+
+async def exportar_archivo_en_api_async(client: httpx.AsyncClient, nombre_archivo: str) -> Dict[str, Any]:
+    """
+    Versión asíncrona de exportar_archivo_en_api.
+    """
+    nombre_codificado = urllib.parse.quote_plus(nombre_archivo)
+    response = await client.post(f"/exportar/{nombre_codificado}")
+    _raise_with_detail(response, "exportar archivo")
+    return response.json()
+
+async def descargar_archivo_desde_api_async(
+    client: httpx.AsyncClient,
+    nombre_archivo: str,
+    ruta_guardado: str
+) -> str:
+    """
+    Versión asíncrona de descargar_archivo_desde_api. Escribe el archivo por bloques.
+    """
+    nombre_codificado = urllib.parse.quote_plus(nombre_archivo)
+    async with client.stream("GET", f"/descargar/{nombre_codificado}") as response:
+        if response.is_error:
+            await response.aread()  # El detalle del error está en el cuerpo
+        _raise_with_detail(response, "descargar archivo")
+        with open(ruta_guardado, 'wb') as f:
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+    print(f"Archivo '{nombre_archivo}' descargado exitosamente en '{ruta_guardado}'")
+    return ruta_guardado
+
+async def consultar_debug_archivos_en_api_async(client: httpx.AsyncClient) -> Dict[str, Any]:
+    """
+    Versión asíncrona de consultar_debug_archivos_en_api.
+    """
+    response = await client.get("/debug_archivos/")
+    _raise_with_detail(response, "consultar /debug_archivos/")
+    return response.json()
+
+# --- EJEMPLO DE USO ---
+async def main_async() -> None:
+    """Ejecuta el mismo flujo que cliente_api.main() sobre un único cliente HTTP/2."""
+    nombre_excel_nuevo = "mi_informe_de_prueba.xlsx"
+
+    async with crear_cliente_async() as client:
+        try:
+            resultado_creacion = await crear_archivo_excel_en_api_async(client, nombre_excel_nuevo)
+            print(f"Resultado de creación: {resultado_creacion}")
+        except Exception as e:
+            print(f"No se pudo crear el archivo: {e}")
+            return
+
+        datos_audiencia_ejemplo: Dict[str, Any] = {
+            "radicado": "12345-ABC",
+            "tipo_audiencia": "Audiencia de conciliación",
+            "fecha": "25/07/2024",
+            "hora": "10:00",
+            "juzgado": "Juzgado 1 Civil",
+            "se_realizo": "SI",
+            "motivos": [],
+            "observaciones": "Audiencia exitosa",
+            "nombre_archivo": nombre_excel_nuevo
+        }
+        try:
+            resultado_guardado = await guardar_audiencia_en_api_async(client, datos_audiencia_ejemplo)
+            print(f"Resultado de guardado: {resultado_guardado}")
+        except Exception as e:
+            print(f"No se pudo guardar la audiencia: {e}")
+
+        async def exportar_y_descargar() -> str:
+            await exportar_archivo_en_api_async(client, nombre_excel_nuevo)
+            os.makedirs("./descargas", exist_ok=True)
+            return await descargar_archivo_desde_api_async(
+                client, nombre_excel_nuevo, f"./descargas/{nombre_excel_nuevo}"
+            )
+
+        # Las llamadas independientes comparten la conexión HTTP/2 con la cadena exportar -> descargar
+        archivos, debug, descarga = await asyncio.gather(
+            listar_archivos_en_api_async(client),
+            consultar_debug_archivos_en_api_async(client),
+            exportar_y_descargar(),
+            return_exceptions=True,
+        )
+        print(f"Archivos en el servidor: {archivos}")
+        print(f"Respuesta de /debug_archivos/: {debug if isinstance(debug, Exception) else json.dumps(debug, indent=2)}")
+        print(f"Archivo descargado en: {descarga}")
+
+def main() -> None:
+    """Envoltorio síncrono de main_async()."""
+    asyncio.run(main_async())
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,22 @@
-import base64
+import hashlib
+import json
+import mmap
 import os
 
+# pybase64 codifica con SIMD en C; si no está instalado se usa la librería estándar
+try:
+    import pybase64 as _b64
+    _b64encode_str = _b64.b64encode_as_string
+except ImportError:
+    import base64 as _b64
+
+    def _b64encode_str(datos):
+        return _b64.b64encode(datos).decode('ascii')
+
+# Bloque de lectura múltiplo de 3: así cada bloque se codifica sin relleno '='
+# intermedio y la concatenación es idéntica a codificar el archivo completo.
+BLOQUE_BASE64 = 57 * 1024
+
 def convertir_excel_a_base64(ruta_archivo):
     """
     Convierte un archivo Excel a string Base64 para embeber en código.
@@ -19,27 +35,100 @@ def convertir_excel_a_base64(ruta_archivo):
         raise ValueError("El archivo debe ser un Excel (.xlsx o .xls)")
     
     try:
+        # Mapea el archivo en memoria: el codificador lee directamente de la caché
+        # de páginas del sistema, sin copiar el contenido a un bytes intermedio
         with open(ruta_archivo, "rb") as archivo_excel:
-            # Codifica el contenido a Base64
-            contenido_binario = archivo_excel.read()
-            string_base64 = base64.b64encode(contenido_binario).decode('utf-8')
+            tamaño = os.fstat(archivo_excel.fileno()).st_size
+            if tamaño == 0:
+                # mmap no admite archivos vacíos; su Base64 es la cadena vacía
+                string_base64 = ""
+            else:
+                with mmap.mmap(archivo_excel.fileno(), 0, access=mmap.ACCESS_READ) as contenido_binario:
+                    # Codifica el contenido a Base64
+                    string_base64 = _b64encode_str(contenido_binario)
+            tamaño_kb = tamaño / 1024
         
-        # Muestra información del archivo
-        tamaño_kb = len(contenido_binario) / 1024
+        # Muestra información del archivo (el string se devuelve, no se imprime)
         print(f"Archivo: {ruta_archivo}")
         print(f"Tamaño: {tamaño_kb:.2f} KB")
         print(f"Longitud del string Base64: {len(string_base64)} caracteres")
-        print("\n" + "="*80)
-        print("COPIA EL SIGUIENTE STRING COMPLETO (incluye las comillas):")
-        print("="*80)
-        print(f'"{string_base64}"')
-        print("="*80)
         
         return string_base64
         
     except Exception as e:
         raise Exception(f"Error al procesar el archivo: {str(e)}")
 
+def _ruta_meta(ruta_salida):
+    """
+    Ruta del archivo de metadatos asociado a la salida (p. ej. plantilla_base64.meta.json).
+    """
+    return os.path.splitext(ruta_salida)[0] + ".meta.json"
+
+def convertir_excel_a_base64_stream(ruta_archivo, ruta_salida):
+    """
+    Convierte un archivo Excel a Base64 escribiendo directamente en `ruta_salida`.
+    Codifica por bloques, así la memoria usada no depende del tamaño del archivo.
+    Si la plantilla no cambió desde la última conversión (mismo tamaño y fecha de
+    modificación según el archivo .meta.json), no vuelve a codificarla.
+    
+    Args:
+        ruta_archivo (str): Ruta al archivo Excel a convertir
+        ruta_salida (str): Ruta del archivo de texto donde se escribe el Base64
+        
+    Returns:
+        int: Longitud del string Base64 escrito
+    """
+    
+    if not os.path.exists(ruta_archivo):
+        raise FileNotFoundError(f"No se encontró el archivo: {ruta_archivo}")
+    
+    if not ruta_archivo.endswith(('.xlsx', '.xls')):
+        raise ValueError("El archivo debe ser un Excel (.xlsx o .xls)")
+    
+    ruta_meta = _ruta_meta(ruta_salida)
+    estado = os.stat(ruta_archivo)
+    if os.path.exists(ruta_salida) and os.path.exists(ruta_meta):
+        try:
+            with open(ruta_meta, "r", encoding="utf-8") as archivo_meta:
+                meta = json.load(archivo_meta)
+            if meta["size"] == estado.st_size and meta["mtime"] == estado.st_mtime:
+                print(f"Archivo: {ruta_archivo} (sin cambios, hash {meta['hash']})")
+                print(f"Se reutiliza la conversión existente en: {ruta_salida}")
+                return meta["longitud_base64"]
+        except (ValueError, KeyError):
+            pass  # Metadatos corruptos o de otro formato: se vuelve a convertir
+    
+    try:
+        tamaño = 0
+        longitud_base64 = 0
+        hash_archivo = hashlib.md5(usedforsecurity=False)
+        with open(ruta_archivo, "rb") as archivo_excel, open(ruta_salida, "wb") as salida:
+            while bloque := archivo_excel.read(BLOQUE_BASE64):
+                codificado = _b64.b64encode(bloque)
+                salida.write(codificado)
+                hash_archivo.update(bloque)
+                tamaño += len(bloque)
+                longitud_base64 += len(codificado)
+        
+        # Guarda los metadatos calculados en la misma pasada para la próxima ejecución
+        with open(ruta_meta, "w", encoding="utf-8") as archivo_meta:
+            json.dump({
+                "size": tamaño,
+                "hash": hash_archivo.hexdigest(),
+                "mtime": estado.st_mtime,
+                "longitud_base64": longitud_base64
+            }, archivo_meta)
+        
+        # Muestra información del archivo
+        print(f"Archivo: {ruta_archivo}")
+        print(f"Tamaño: {tamaño / 1024:.2f} KB")
+        print(f"Longitud del string Base64: {longitud_base64} caracteres")
+        
+        return longitud_base64
+        
+    except Exception as e:
+        raise Exception(f"Error al procesar el archivo: {str(e)}")
+
 # Uso del script
 if __name__ == "__main__":
     # CAMBIA ESTA RUTA por la ubicación real de tu plantilla
@@ -49,12 +138,9 @@ if __name__ == "__main__":
     # ruta_plantilla = r"C:\ruta\completa\a\tu\plantilla_base.xlsx"  # Ruta absoluta
     
     try:
-        string_base64 = convertir_excel_a_base64(ruta_plantilla)
-        
-        # Opcional: guardar en archivo de texto para fácil copia
-        with open("plantilla_base64.txt", "w") as f:
-            f.write(string_base64)
-        print(f"\nTambién se guardó en: plantilla_base64.txt")
+        # Escribe el Base64 directamente en un archivo de texto para fácil copia
+        convertir_excel_a_base64_stream(ruta_plantilla, "plantilla_base64.txt")
+        print("\nCopia el contenido de: plantilla_base64.txt")
         
     except Exception as e:
         print(f"Error: {e}")
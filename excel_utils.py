@@ -1,10 +1,16 @@
 import os
+import sys
 import shutil
 import base64
 import tempfile
-from typing import List, Dict, Any, Final
+from collections import Counter
+from itertools import islice, zip_longest
+from operator import itemgetter
+from typing import List, Dict, Any, Final, FrozenSet, Tuple
 from openpyxl import load_workbook
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle, Color
+from openpyxl.utils import get_column_letter
+from openpyxl.workbook.workbook import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.cell import Cell
 from datetime import datetime, date
@@ -36,6 +42,12 @@ COL_REALIZADO_NO = 8      # H
 COL_MOTIVOS_INICIO = 9    # I
 COL_MOTIVOS_FIN = 16      # P
 COL_OBSERVACIONES = 17    # Q
+NUM_MOTIVOS = COL_MOTIVOS_FIN - COL_MOTIVOS_INICIO + 1
+
+# Letra de cada columna, indexada por número de columna (LETRAS_COLUMNAS[1] == "A")
+LETRAS_COLUMNAS: Final[Tuple[str, ...]] = ("",) + tuple(
+    get_column_letter(col) for col in range(1, COL_OBSERVACIONES + 1)
+)
 
 # Nueva constante global con los tipos de audiencia válidos
 TIPOS_AUDIENCIA_VALIDOS: Final[List[str]] = [
@@ -58,6 +70,65 @@ TIPOS_AUDIENCIA_VALIDOS: Final[List[str]] = [
     "Audiencia preparatoria",
     "Otra"
 ]
+# Campos que toda audiencia debe traer con valor, en el orden en que se validan
+CAMPOS_OBLIGATORIOS: Final[Tuple[str, ...]] = (
+    'radicado', 'tipo_audiencia', 'fecha', 'hora', 'juzgado', 'se_realizo'
+)
+
+# Valores aceptados de se_realizo sin espacios, en cualquier combinación de
+# mayúsculas, con su forma normalizada
+SE_REALIZO_NORMALIZADO: Final[Dict[str, str]] = {
+    valor: valor.upper()
+    for valor in ('SI', 'Si', 'sI', 'si', 'NO', 'No', 'nO', 'no')
+}
+
+# Conjunto para validar en O(1); las cadenas se internan para que los valores
+# normalizados de cada audiencia compartan el mismo objeto
+TIPOS_AUDIENCIA_VALIDOS_SET: Final[FrozenSet[str]] = frozenset(
+    sys.intern(tipo) for tipo in TIPOS_AUDIENCIA_VALIDOS
+)
+
+# Estilos compartidos: se crean una sola vez al importar el módulo y se asignan
+# por referencia, en lugar de construir objetos nuevos por cada celda escrita
+BORDE_FINO: Final[Side] = Side(style='thin', color='000000')
+BORDES_FINOS: Final[Border] = Border(
+    top=BORDE_FINO,
+    bottom=BORDE_FINO,
+    left=BORDE_FINO,
+    right=BORDE_FINO
+)
+BORDES_CELDA: Final[Border] = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+RELLENO_TOTALES: Final[PatternFill] = PatternFill(
+    fill_type='solid',
+    fgColor='D9D9D9'
+)
+ALINEACION_CENTRADA: Final[Alignment] = Alignment(
+    horizontal='center',
+    vertical='center',
+    wrap_text=True
+)
+FUENTE_TOTALES_MOTIVOS: Final[Font] = Font(
+    name='Calibri',
+    size=11,
+    color='000000'
+)
+
+# Estilos con nombre de las filas de datos: se registran una vez por libro y cada
+# celda solo guarda la referencia al estilo, sin copiar fuente/relleno/borde
+ESTILO_FILA_DATOS: Final[str] = "fila_datos"
+ESTILO_FILA_MOTIVOS: Final[str] = "fila_datos_motivos"
+FUENTE_FILA_DATOS: Final[Font] = Font(
+    name='Calibri',
+    size=11,
+    color=Color(theme=1)
+)
+SIN_BORDES: Final[Border] = Border(left=Side(), right=Side(), top=Side(), bottom=Side())
+ALTURA_FILA_DEFECTO: Final[float] = 20.0
 
 def crear_plantilla_desde_base64() -> str:
     """
@@ -132,9 +203,12 @@ def listar_archivos():
     """
     Lista los archivos .xlsx en la carpeta archivos/.
     """
-    if not os.path.exists(ARCHIVOS_DIR):
+    # scandir trae el tipo de cada entrada junto con el nombre, sin un stat aparte
+    try:
+        with os.scandir(ARCHIVOS_DIR) as entradas:
+            return [e.name for e in entradas if e.name.endswith('.xlsx') and e.is_file()]
+    except FileNotFoundError:
         return []
-    return [f for f in os.listdir(ARCHIVOS_DIR) if f.endswith('.xlsx')]
 
 def limpiar_celdas_combinadas(ws: Worksheet) -> None:
     """
@@ -144,6 +218,19 @@ def limpiar_celdas_combinadas(ws: Worksheet) -> None:
         for rng in list(ws.merged_cells.ranges):
             ws.unmerge_cells(str(rng))
 
+def borrar_filas(ws: Worksheet, fila_inicio: int, fila_fin: int) -> None:
+    """
+    Elimina las celdas de las filas fila_inicio a fila_fin (inclusive) sin
+    desplazar el resto de la hoja.
+    
+    A diferencia de ws.delete_rows, no recorre ni reubica las celdas de las demás
+    filas: solo quita del diccionario interno las que existen en el rango. Las
+    alturas de fila se conservan, igual que con delete_rows.
+    """
+    celdas = ws._cells
+    for coordenada in [c for c in celdas if fila_inicio <= c[0] <= fila_fin]:
+        del celdas[coordenada]
+
 def parse_fecha_hora(d: Dict[str, Any]) -> datetime:
     """
     Parsea y valida los campos 'fecha' y 'hora' en formato dd/mm/yyyy y HH:MM.
@@ -154,6 +241,23 @@ def parse_fecha_hora(d: Dict[str, Any]) -> datetime:
     if not fecha or not hora:
         raise ValueError("Los campos 'fecha' y 'hora' son obligatorios.")
     try:
+        # Camino rápido: formato exacto dd/mm/yyyy HH:MM, se calculan los dígitos
+        # directamente sin pasar por el intérprete de formatos de strptime
+        if (
+            isinstance(fecha, str) and isinstance(hora, str)
+            and len(fecha) == 10 and fecha[2] == '/' and fecha[5] == '/'
+            and len(hora) == 5 and hora[2] == ':'
+        ):
+            digitos = fecha[:2] + fecha[3:5] + fecha[6:] + hora[:2] + hora[3:]
+            if digitos.isascii() and digitos.isdigit():
+                return datetime(
+                    int(fecha[6:10]),
+                    (ord(fecha[3]) - 48) * 10 + ord(fecha[4]) - 48,
+                    (ord(fecha[0]) - 48) * 10 + ord(fecha[1]) - 48,
+                    (ord(hora[0]) - 48) * 10 + ord(hora[1]) - 48,
+                    (ord(hora[3]) - 48) * 10 + ord(hora[4]) - 48,
+                )
+        # Formatos no canónicos (p. ej. "5/7/2024" o "9:05") quedan en manos de strptime
         dt = datetime.strptime(fecha + " " + hora, "%d/%m/%Y %H:%M")
     except Exception:
         raise ValueError(f"Fecha y hora inválidas: '{fecha} {hora}'. Formato esperado: dd/mm/yyyy HH:MM")
@@ -169,27 +273,70 @@ def validar_campos_audiencia(d: Dict[str, Any]) -> None:
     Raises:
         ValueError: Si falta algún campo obligatorio o si los valores no son válidos
     """
-    obligatorios = ['radicado', 'tipo_audiencia', 'fecha', 'hora', 'juzgado', 'se_realizo']
-    for campo in obligatorios:
+    for campo in CAMPOS_OBLIGATORIOS:
         if not d.get(campo):
             raise ValueError(f"El campo '{campo}' es obligatorio.")
     
-    # Valida tipo_audiencia contra la lista de tipos válidos
-    tipo_audiencia = str(d['tipo_audiencia']).strip()
-    if tipo_audiencia not in TIPOS_AUDIENCIA_VALIDOS:
-        raise ValueError(
-            f"El tipo de audiencia '{tipo_audiencia}' no es válido. "
-            f"Debe ser uno de los siguientes valores: {', '.join(TIPOS_AUDIENCIA_VALIDOS)}"
-        )
+    # Valida tipo_audiencia contra la lista de tipos válidos; solo se limpia el
+    # valor si no coincide tal cual
+    tipo_audiencia = d['tipo_audiencia']
+    if not isinstance(tipo_audiencia, str) or tipo_audiencia not in TIPOS_AUDIENCIA_VALIDOS_SET:
+        tipo_audiencia = str(tipo_audiencia).strip()
+        if tipo_audiencia not in TIPOS_AUDIENCIA_VALIDOS_SET:
+            raise ValueError(
+                f"El tipo de audiencia '{tipo_audiencia}' no es válido. "
+                f"Debe ser uno de los siguientes valores: {', '.join(TIPOS_AUDIENCIA_VALIDOS)}"
+            )
     
-    # Valida se_realizo
-    se_realizo = str(d['se_realizo']).strip().upper()
-    if se_realizo not in ['SI', 'NO']:
-        raise ValueError("El campo 'se_realizo' debe ser 'SI' o 'NO'.")
+    # Valida se_realizo: las grafías habituales se resuelven con una búsqueda
+    se_realizo = d['se_realizo']
+    se_realizo = SE_REALIZO_NORMALIZADO.get(se_realizo) if isinstance(se_realizo, str) else None
+    if se_realizo is None:
+        se_realizo = str(d['se_realizo']).strip().upper()
+        if se_realizo not in SE_REALIZO_NORMALIZADO:
+            raise ValueError("El campo 'se_realizo' debe ser 'SI' o 'NO'.")
     d['se_realizo'] = se_realizo  # Normaliza el valor
 
     # Normaliza el tipo de audiencia para asegurar consistencia
-    d['tipo_audiencia'] = tipo_audiencia
+    d['tipo_audiencia'] = sys.intern(tipo_audiencia)
+
+# --- APERTURA Y GUARDADO DE LIBROS ---
+# Cada operación abre el libro desde disco. No se reutilizan objetos Workbook
+# entre guardados: openpyxl consume y cierra las imágenes del libro (el logo de
+# la plantilla) al guardar, y un segundo save del mismo objeto falla.
+
+def cargar_libro(ruta: str) -> Workbook:
+    """
+    Abre el libro de `ruta`. Las plantillas no tienen vínculos externos, así que
+    no se cargan (keep_links=False).
+    """
+    return load_workbook(ruta, keep_links=False)
+
+def guardar_libro(wb: Workbook, ruta: str, ruta_permisos: str = "") -> None:
+    """
+    Guarda el libro en un temporal dentro de ARCHIVOS_DIR y lo mueve a `ruta` con
+    os.replace: si el guardado falla, el archivo existente queda intacto, y una
+    descarga simultánea nunca ve un archivo a medio escribir.
+    
+    Args:
+        wb: Libro a guardar
+        ruta: Ruta destino
+        ruta_permisos: Archivo del que se copian los permisos; por defecto `ruta`
+            si ya existe
+    """
+    ruta_permisos = ruta_permisos or ruta
+    fd, ruta_temporal = tempfile.mkstemp(dir=ARCHIVOS_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        wb.save(ruta_temporal)
+        if os.path.exists(ruta_permisos):
+            shutil.copymode(ruta_permisos, ruta_temporal)
+        os.replace(ruta_temporal, ruta)
+    except BaseException:
+        os.unlink(ruta_temporal)
+        raise
+    finally:
+        wb.close()
 
 def guardar_audiencias_excel(
     datos: List[Dict[str, Any]],
@@ -206,96 +353,115 @@ def guardar_audiencias_excel(
     if not os.path.exists(ruta):
         raise FileNotFoundError(f"El archivo {ruta} no existe.")
 
-    wb = load_workbook(ruta)
+    wb = cargar_libro(ruta)
     ws = wb.active
     if ws is None:
         wb.close()
         raise ValueError("No se pudo cargar la hoja activa del archivo Excel.")
+
+    escribir_audiencias(wb, ws, datos)
+
+    # Guarda el archivo
+    guardar_libro(wb, ruta)
+
+def escribir_audiencias(
+    wb: Workbook,
+    ws: Worksheet,
+    datos: List[Dict[str, Any]]
+) -> None:
+    """
+    Reescribe en memoria todas las filas de datos y los totales de la hoja con
+    las audiencias indicadas, ordenadas de la más reciente a la más antigua.
+    No guarda el libro.
+    """
     limpiar_celdas_combinadas(ws)
 
     # Borra todas las filas de datos previas, pero preserva la firma
-    max_row = min(ws.max_row, MAX_FILA_PERMITIDA - 1)  # Nunca borrar más allá de fila 188
-    if max_row > FILA_ENCABEZADO:
-        filas_a_borrar = max_row - FILA_ENCABEZADO
-        ws.delete_rows(FILA_ENCABEZADO + 1, filas_a_borrar)
+    if ws.max_row > FILA_ENCABEZADO:
+        borrar_filas(ws, FILA_ENCABEZADO + 1, MAX_FILA_PERMITIDA - 1)  # Nunca borrar más allá de la fila 299
 
-    # Validación y ordenamiento
+    # Validación y ordenamiento: cada fecha se parsea una sola vez y se ordena
+    # por el datetime ya calculado
+    datos_con_fecha = []
     for d in datos:
         validar_campos_audiencia(d)
-        parse_fecha_hora(d)
+        datos_con_fecha.append((parse_fecha_hora(d), d))
 
-    datos_ordenados = sorted(datos, key=parse_fecha_hora, reverse=True)
-
-    # Define estilos para las celdas
-    borde_fino = Side(style='thin')
-    bordes_celda = Border(
-        left=borde_fino,
-        right=borde_fino,
-        top=borde_fino,
-        bottom=borde_fino
-    )
-    
-    fondo_totales = PatternFill(
-        start_color='E0E0E0',  # Gris claro
-        end_color='E0E0E0',
-        fill_type='solid'
-    )
+    datos_con_fecha.sort(key=itemgetter(0), reverse=True)
+    datos_ordenados = [d for _, d in datos_con_fecha]
 
     # Escribe los datos y aplica estilos
+    registrar_estilos_fila(wb)
+    asegurar_anchos_columnas(ws)
+    altura_fila: float = ws.row_dimensions[FILA_ENCABEZADO + 1].height or ALTURA_FILA_DEFECTO
     for idx, d in enumerate(datos_ordenados, start=1):
-        fila = FILA_ENCABEZADO + idx
-        
-        # Escribe datos
-        ws.cell(row=fila, column=COL_NRO, value=idx)
-        ws.cell(row=fila, column=COL_RADICADO, value=d["radicado"])
-        ws.cell(row=fila, column=COL_TIPO, value=d["tipo_audiencia"])
-        ws.cell(row=fila, column=COL_FECHA, value=d["fecha"])
-        ws.cell(row=fila, column=COL_HORA, value=d["hora"])
-        ws.cell(row=fila, column=COL_JUZGADO, value=d["juzgado"])
-        
-        # Escribe SI/NO como X en la columna correspondiente
-        ws.cell(row=fila, column=COL_REALIZADO_SI, value="")  # Limpia
-        ws.cell(row=fila, column=COL_REALIZADO_NO, value="")  # Limpia
-        if d["se_realizo"] == "SI":
-            ws.cell(row=fila, column=COL_REALIZADO_SI, value="X")
-        elif d["se_realizo"] == "NO":
-            ws.cell(row=fila, column=COL_REALIZADO_NO, value="X")
-
-        ws.cell(row=fila, column=COL_OBSERVACIONES, value=d.get("observaciones", ""))
-        # Motivos
-        for i, col in enumerate(range(COL_MOTIVOS_INICIO, COL_MOTIVOS_FIN + 1)):
-            motivo = d.get("motivos", [])[i] if i < len(d.get("motivos", [])) else ""
-            ws.cell(row=fila, column=col, value=motivo)
-            ws.cell(row=fila, column=col, value=motivo)
-
-        # Aplica bordes a las celdas de motivos
-        for col in range(COL_MOTIVOS_INICIO, COL_MOTIVOS_FIN + 1):
-            celda = ws.cell(row=fila, column=col)
-            celda.border = bordes_celda
-
-        # Copia estilos de la fila 11
-        copiar_estilos_fila(ws, FILA_ENCABEZADO + 1, fila)
-    
-    # --- ELIMINA FILAS DE TOTALES PREVIAS ---
-    # Busca desde la fila justo después de los datos hacia abajo
-    fila_datos_fin = FILA_ENCABEZADO + len(datos_ordenados)
-    fila_busqueda = fila_datos_fin + 1
-    filas_a_borrar = []
-    while ws.cell(row=fila_busqueda, column=7).value or ws.cell(row=fila_busqueda, column=8).value:
-        valor_g = str(ws.cell(row=fila_busqueda, column=7).value or "")
-        valor_h = str(ws.cell(row=fila_busqueda, column=8).value or "")
-        if valor_g.startswith("TOTAL DE") or valor_h.startswith("TOTAL DE"):
-            filas_a_borrar.append(fila_busqueda)
-            fila_busqueda += 1
-        else:
-            break
-    # Borra de abajo hacia arriba para no desplazar filas
-    for f in reversed(filas_a_borrar):
-        ws.delete_rows(f, 1)
+        escribir_fila_audiencia(ws, FILA_ENCABEZADO + idx, idx, d, altura_fila)
+    
+    escribir_totales(ws, datos_ordenados)
 
+def escribir_fila_audiencia(
+    ws: Worksheet,
+    fila: int,
+    idx: int,
+    d: Dict[str, Any],
+    altura_fila: float
+) -> None:
+    """
+    Escribe una audiencia en la fila indicada y le asigna los estilos de fila de datos.
+    
+    Args:
+        ws: Hoja de trabajo activa
+        fila: Número de fila donde se escribe la audiencia
+        idx: Número consecutivo de la audiencia (columna A)
+        d: Diccionario con los datos de la audiencia, ya validado
+        altura_fila: Altura a asignar a la fila
+    """
+    cell = ws.cell  # Referencia local: evita resolver el atributo en cada celda
+
+    # Escribe datos de las columnas fijas (A-H y Q) en una sola pasada;
+    # SI/NO se marcan con X en la columna correspondiente y la otra se limpia
+    valores_fila = (
+        (COL_NRO, idx),
+        (COL_RADICADO, d["radicado"]),
+        (COL_TIPO, d["tipo_audiencia"]),
+        (COL_FECHA, d["fecha"]),
+        (COL_HORA, d["hora"]),
+        (COL_JUZGADO, d["juzgado"]),
+        (COL_REALIZADO_SI, "X" if d["se_realizo"] == "SI" else ""),
+        (COL_REALIZADO_NO, "X" if d["se_realizo"] == "NO" else ""),
+        (COL_OBSERVACIONES, d.get("observaciones", "")),
+    )
+    for col, valor in valores_fila:
+        cell(row=fila, column=col, value=valor)
+
+    # Motivos: las columnas I-P sin motivo quedan con "" y cada celda se escribe
+    # y recibe su estilo en la misma pasada, sin construir una lista rellenada
+    motivos = d.get("motivos") or ()
+    n_motivos = len(motivos)
+    for i, col in enumerate(range(COL_MOTIVOS_INICIO, COL_MOTIVOS_FIN + 1)):
+        motivo = motivos[i] if i < n_motivos else ""
+        cell(row=fila, column=col, value=motivo).style = ESTILO_FILA_MOTIVOS
+
+    for col, _ in valores_fila:
+        cell(row=fila, column=col).style = ESTILO_FILA_DATOS
+    ws.row_dimensions[fila].height = altura_fila
+
+def escribir_totales(ws: Worksheet, datos_ordenados: List[Dict[str, Any]]) -> None:
+    """
+    Escribe, justo debajo de las filas de datos, la fila de totales SI/NO y la
+    fila de totales de motivos, con sus estilos.
+    
+    Args:
+        ws: Hoja de trabajo activa
+        datos_ordenados: Audiencias en el mismo orden en que están escritas en la hoja
+    
+    Raises:
+        ValueError: Si los totales invadirían la zona de la firma
+    """
     # Agrega nueva fila de totales
-    total_si = sum(1 for d in datos_ordenados if d["se_realizo"] == "SI")
-    total_no = sum(1 for d in datos_ordenados if d["se_realizo"] == "NO")
+    conteo_realizadas = Counter(d["se_realizo"] for d in datos_ordenados)
+    total_si = conteo_realizadas["SI"]
+    total_no = conteo_realizadas["NO"]
     fila_totales = FILA_ENCABEZADO + len(datos_ordenados) + 1
 
     if fila_totales > MAX_FILA_PERMITIDA:
@@ -307,15 +473,6 @@ def guardar_audiencias_excel(
     ws.cell(row=fila_totales, column=COL_REALIZADO_NO, 
             value=f"TOTAL DE AUDIENCIAS NO REALIZADAS: {total_no}")
 
-    # Aplica estilos a las celdas de totales
-    celda_total_si = ws.cell(row=fila_totales, column=COL_REALIZADO_SI)
-    celda_total_no = ws.cell(row=fila_totales, column=COL_REALIZADO_NO)
-
-    celda_total_si.fill = fondo_totales
-    celda_total_no.fill = fondo_totales
-    celda_total_si.border = bordes_celda
-    celda_total_no.border = bordes_celda
-
     # Aplica estilos a totales
     aplicar_estilos_totales(ws.cell(row=fila_totales, column=COL_REALIZADO_SI))
     aplicar_estilos_totales(ws.cell(row=fila_totales, column=COL_REALIZADO_NO))
@@ -342,19 +499,20 @@ def guardar_audiencias_excel(
         COL_MOTIVOS_INICIO + 7: "Defensor Público"
     }
 
-    # Cuenta ocurrencias de cada motivo
-    conteo_motivos = {col: 0 for col in range(COL_MOTIVOS_INICIO, COL_MOTIVOS_FIN + 1)}
-    
-    # Solo cuenta motivos de audiencias no realizadas
-    for fila in range(FILA_ENCABEZADO + 1, fila_totales):
-        # Verifica si la audiencia no se realizó
-        if ws.cell(row=fila, column=COL_REALIZADO_NO).value == "X":
-            for col in conteo_motivos.keys():
-                if ws.cell(row=fila, column=col).value:
-                    conteo_motivos[col] += 1
+    # Cuenta ocurrencias de cada motivo desde los datos en memoria, sin volver
+    # a leer las celdas; solo cuentan las audiencias no realizadas. Los motivos
+    # se transponen a columnas y cada columna se cuenta con sum(map(bool, ...)),
+    # que recorre los valores en C en lugar de un bucle Python por celda
+    motivos_no_realizadas = [
+        d.get("motivos") or () for d in datos_ordenados if d["se_realizo"] == "NO"
+    ]
+    columnas_motivos = zip_longest(*motivos_no_realizadas, fillvalue="")
+    conteo_motivos = [sum(map(bool, columna)) for columna in islice(columnas_motivos, NUM_MOTIVOS)]
+    conteo_motivos += [0] * (NUM_MOTIVOS - len(conteo_motivos))
 
     # Escribe los totales de motivos y aplica estilos
-    for col, total in conteo_motivos.items():
+    for i, total in enumerate(conteo_motivos):
+        col = COL_MOTIVOS_INICIO + i
         # Escribe el total
         celda_total = ws.cell(
             row=fila_totales_motivos, 
@@ -364,9 +522,99 @@ def guardar_audiencias_excel(
         # Aplica estilos
         aplicar_estilos_totales_motivos(celda_total)
 
-    # Guarda y cierra el archivo
-    wb.save(ruta)
-    wb.close()
+def leer_audiencias_existentes(ws: Worksheet) -> List[Dict[str, Any]]:
+    """
+    Lee las audiencias ya guardadas en la hoja, desde la primera fila de datos
+    hasta la primera fila sin radicado.
+    """
+    audiencias_existentes = []
+    # iter_rows entrega los valores de cada fila en una tupla (A-Q), sin buscar
+    # celda por celda; la columna N queda en la posición N - 1
+    for valores in ws.iter_rows(
+        min_row=FILA_ENCABEZADO + 1,
+        max_row=ws.max_row,
+        max_col=COL_OBSERVACIONES,
+        values_only=True
+    ):
+        if not valores[COL_RADICADO - 1]:
+            break
+
+        # Determina se_realizo basado en X en columnas G/H
+        valor_si = valores[COL_REALIZADO_SI - 1]
+        valor_no = valores[COL_REALIZADO_NO - 1]
+        se_realizo = ""
+        if valor_si and str(valor_si).strip() == "X":
+            se_realizo = "SI"
+        elif valor_no and str(valor_no).strip() == "X":
+            se_realizo = "NO"
+
+        registro = {
+            "radicado": valores[COL_RADICADO - 1],
+            "tipo_audiencia": valores[COL_TIPO - 1],
+            "fecha": valores[COL_FECHA - 1],
+            "hora": valores[COL_HORA - 1],
+            "juzgado": valores[COL_JUZGADO - 1],
+            "se_realizo": se_realizo,
+            "observaciones": valores[COL_OBSERVACIONES - 1],
+            "motivos": [
+                motivo or ""
+                for motivo in valores[COL_MOTIVOS_INICIO - 1:COL_MOTIVOS_FIN]
+            ]
+        }
+        audiencias_existentes.append(registro)
+    return audiencias_existentes
+
+def puede_agregar_al_final(
+    ws: Worksheet,
+    audiencias_existentes: List[Dict[str, Any]],
+    d: Dict[str, Any]
+) -> bool:
+    """
+    Indica si la audiencia nueva puede escribirse al final sin reescribir la hoja:
+    la hoja tiene el formato que deja guardar_audiencias_excel (datos ordenados
+    seguidos de las dos filas de totales) y la nueva audiencia es la más antigua.
+    Valida las audiencias igual que la reescritura completa.
+    """
+    n = len(audiencias_existentes)
+    if not n or ws.merged_cells.ranges:
+        return False
+
+    fila_totales = FILA_ENCABEZADO + n + 1
+    if ws.max_row != fila_totales + 1 or fila_totales + 2 >= MAX_FILA_PERMITIDA:
+        return False
+    valor_g = str(ws.cell(row=fila_totales, column=COL_REALIZADO_SI).value or "")
+    if not valor_g.startswith("TOTAL DE"):
+        return False
+
+    fecha_anterior = None
+    for a in audiencias_existentes + [d]:
+        validar_campos_audiencia(a)
+        fecha = parse_fecha_hora(a)
+        if fecha_anterior is not None and fecha > fecha_anterior:
+            return False
+        fecha_anterior = fecha
+    return True
+
+def agregar_audiencia_al_final(
+    wb: Workbook,
+    ws: Worksheet,
+    audiencias_existentes: List[Dict[str, Any]],
+    d: Dict[str, Any]
+) -> None:
+    """
+    Escribe la audiencia nueva debajo de las existentes y rehace los totales.
+    Requiere que puede_agregar_al_final haya devuelto True.
+    """
+    n = len(audiencias_existentes)
+    fila = FILA_ENCABEZADO + n + 1
+
+    # Quita las filas de totales actuales; la nueva audiencia ocupa su lugar
+    borrar_filas(ws, fila, fila + 1)
+
+    registrar_estilos_fila(wb)
+    altura_fila: float = ws.row_dimensions[FILA_ENCABEZADO + 1].height or ALTURA_FILA_DEFECTO
+    escribir_fila_audiencia(ws, fila, n + 1, d, altura_fila)
+    escribir_totales(ws, audiencias_existentes + [d])
 
 def guardar_una_audiencia_excel(
     d: Dict[str, Any], 
@@ -380,40 +628,14 @@ def guardar_una_audiencia_excel(
     if not os.path.exists(ruta):
         raise FileNotFoundError(f"El archivo {ruta} no existe.")
 
-    wb = load_workbook(ruta)
+    wb = cargar_libro(ruta)
     ws = wb.active
     if ws is None:
         wb.close()
         raise ValueError("No se pudo cargar la hoja activa del archivo Excel.")
 
     # Leer audiencias existentes
-    audiencias_existentes = []
-    fila = FILA_ENCABEZADO + 1
-    while ws.cell(row=fila, column=COL_RADICADO).value:
-        # Determina se_realizo basado en X en columnas G/H
-        valor_si = ws.cell(row=fila, column=COL_REALIZADO_SI).value
-        valor_no = ws.cell(row=fila, column=COL_REALIZADO_NO).value
-        se_realizo = ""
-        if valor_si and str(valor_si).strip() == "X":
-            se_realizo = "SI"
-        elif valor_no and str(valor_no).strip() == "X":
-            se_realizo = "NO"
-
-        registro = {
-            "radicado": ws.cell(row=fila, column=COL_RADICADO).value,
-            "tipo_audiencia": ws.cell(row=fila, column=COL_TIPO).value,
-            "fecha": ws.cell(row=fila, column=COL_FECHA).value,
-            "hora": ws.cell(row=fila, column=COL_HORA).value,
-            "juzgado": ws.cell(row=fila, column=COL_JUZGADO).value,
-            "se_realizo": se_realizo,
-            "observaciones": ws.cell(row=fila, column=COL_OBSERVACIONES).value,
-            "motivos": [
-                ws.cell(row=fila, column=col).value or ""
-                for col in range(COL_MOTIVOS_INICIO, COL_MOTIVOS_FIN + 1)
-            ]
-        }
-        audiencias_existentes.append(registro)
-        fila += 1
+    audiencias_existentes = leer_audiencias_existentes(ws)
 
     # Verifica duplicados
     nuevo_radicado = str(d.get('radicado', '')).strip()
@@ -422,16 +644,102 @@ def guardar_una_audiencia_excel(
         wb.close()
         raise ValueError(f"Ya existe una audiencia con el radicado '{nuevo_radicado}'.")
 
-    # Agrega y guarda
-    audiencias_existentes.append(d)
-    wb.close()
-    guardar_audiencias_excel(audiencias_existentes, nombre_archivo)
+    validar_no_es_plantilla(nombre_archivo)
+
+    # Camino rápido: si la nueva audiencia queda de última en el orden (es la
+    # más antigua), solo se escriben su fila y los totales
+    if puede_agregar_al_final(ws, audiencias_existentes, d):
+        agregar_audiencia_al_final(wb, ws, audiencias_existentes, d)
+        audiencias_existentes.append(d)
+    else:
+        # Agrega y reescribe la hoja sobre el mismo libro, sin volver a abrirlo
+        audiencias_existentes.append(d)
+        escribir_audiencias(wb, ws, audiencias_existentes)
+
+    guardar_libro(wb, ruta)
 
     return {
         "estado": "ok",
         "audiencias_guardadas": len(audiencias_existentes)
     }
 
+def preparar_varias_audiencias_excel(
+    nuevas: List[Dict[str, Any]],
+    nombre_archivo: str
+) -> Tuple[Workbook, Worksheet, List[Dict[str, Any]]]:
+    """
+    Abre el archivo y valida el lote completo (campos, fechas, duplicados y
+    espacio disponible) sin escribir nada en disco.
+    Retorna el libro, la hoja y la lista de audiencias existentes más las nuevas,
+    lista para escribir_audiencias.
+    
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+        ValueError: Si alguna audiencia no es válida o el lote no cabe en la hoja
+    """
+    ruta = os.path.join(ARCHIVOS_DIR, nombre_archivo)
+    if not os.path.exists(ruta):
+        raise FileNotFoundError(f"El archivo {ruta} no existe.")
+
+    wb = cargar_libro(ruta)
+    ws = wb.active
+    if ws is None:
+        wb.close()
+        raise ValueError("No se pudo cargar la hoja activa del archivo Excel.")
+
+    audiencias_existentes = leer_audiencias_existentes(ws)
+
+    # Verifica duplicados contra el archivo y dentro del mismo lote
+    radicados = {str(a.get('radicado', '')).strip() for a in audiencias_existentes}
+    for d in nuevas:
+        nuevo_radicado = str(d.get('radicado', '')).strip()
+        if nuevo_radicado in radicados:
+            wb.close()
+            raise ValueError(f"Ya existe una audiencia con el radicado '{nuevo_radicado}'.")
+        radicados.add(nuevo_radicado)
+
+    validar_no_es_plantilla(nombre_archivo)
+    audiencias_existentes.extend(nuevas)
+
+    # Mismas validaciones que hará escribir_audiencias, para fallar antes de escribir
+    for d in audiencias_existentes:
+        validar_campos_audiencia(d)
+        parse_fecha_hora(d)
+    if FILA_ENCABEZADO + len(audiencias_existentes) + 2 >= MAX_FILA_PERMITIDA:
+        wb.close()
+        raise ValueError("Demasiadas audiencias: podrías sobrescribir la firma del defensor.")
+
+    return wb, ws, audiencias_existentes
+
+def guardar_varias_audiencias_excel(
+    nuevas: List[Dict[str, Any]],
+    nombre_archivo: str
+) -> Dict[str, Any]:
+    """
+    Guarda varias audiencias en el archivo Excel abriéndolo y guardándolo una sola vez.
+    Retorna un diccionario con el estado y número de audiencias guardadas.
+    """
+    wb, ws, audiencias = preparar_varias_audiencias_excel(nuevas, nombre_archivo)
+    return escribir_varias_audiencias_excel(wb, ws, audiencias, nombre_archivo)
+
+def escribir_varias_audiencias_excel(
+    wb: Workbook,
+    ws: Worksheet,
+    audiencias: List[Dict[str, Any]],
+    nombre_archivo: str
+) -> Dict[str, Any]:
+    """
+    Escribe y guarda las audiencias devueltas por preparar_varias_audiencias_excel.
+    Retorna un diccionario con el estado y número de audiencias guardadas.
+    """
+    escribir_audiencias(wb, ws, audiencias)
+    guardar_libro(wb, os.path.join(ARCHIVOS_DIR, nombre_archivo))
+
+    return {
+        "estado": "ok",
+        "audiencias_guardadas": len(audiencias)
+    }
+
 def validar_no_es_plantilla(nombre_archivo: str) -> None:
     """
     Verifica que el archivo a usar no sea la plantilla base.
@@ -460,25 +768,33 @@ def exportar_con_firma(nombre_archivo: str) -> str:
     nombre_exportado = f"{nombre_base}_exportado_{fecha_actual}.xlsx"
     ruta_destino = os.path.join(ARCHIVOS_DIR, nombre_exportado)
     
-    # Copia el archivo
-    shutil.copy2(ruta_origen, ruta_destino)
-    
-    # Abre la copia y agrega la firma
-    wb = load_workbook(ruta_destino)
+    # Abre el original y agrega la firma en memoria; el resultado se guarda
+    # directamente como archivo exportado, sin copiar antes el original
+    wb = load_workbook(ruta_origen, keep_links=False)
     ws = wb.active
     if ws is None:
         wb.close()
-        os.unlink(ruta_destino)  # Elimina la copia si hay error
         raise ValueError("No se pudo procesar el archivo Excel")
 
-    # Encuentra la última fila con datos incluyendo totales y motivos
+    # Encuentra la última fila con datos incluyendo totales y motivos, en una
+    # sola pasada por los valores de las columnas B-H
     ultima_fila = FILA_ENCABEZADO
-    while ws.cell(row=ultima_fila + 1, column=COL_RADICADO).value:
-        ultima_fila += 1
-    
-    # Avanza más allá de los totales y motivos
-    while (ws.cell(row=ultima_fila + 1, column=COL_REALIZADO_SI).value or 
-           ws.cell(row=ultima_fila + 1, column=COL_REALIZADO_NO).value):
+    en_datos = True
+    for radicado, *_, valor_si, valor_no in ws.iter_rows(
+        min_row=FILA_ENCABEZADO + 1,
+        max_row=ws.max_row,
+        min_col=COL_RADICADO,
+        max_col=COL_REALIZADO_NO,
+        values_only=True
+    ):
+        if en_datos and radicado:
+            ultima_fila += 1
+            continue
+        
+        # Avanza más allá de los totales y motivos
+        en_datos = False
+        if not (valor_si or valor_no):
+            break
         ultima_fila += 1
     
     # Inserta la firma en la siguiente fila
@@ -521,158 +837,55 @@ def exportar_con_firma(nombre_archivo: str) -> str:
                     right=borde_grueso
                 )
 
-    # Guarda y cierra
-    wb.save(ruta_destino)
-    wb.close()
+    # Guarda de forma atómica, con los permisos del original
+    guardar_libro(wb, ruta_destino, ruta_permisos=ruta_origen)
     
     return ruta_destino
 
-def copiar_estilos_fila(
-    ws: Worksheet,
-    fila_origen: int,
-    fila_destino: int
-) -> None:
+def registrar_estilos_fila(wb: Workbook) -> None:
     """
-    Copia los estilos de una fila origen a una fila destino.
+    Registra en el libro los estilos con nombre de las filas de datos, si aún no existen.
     
     Args:
-        ws: Hoja de trabajo activa
-        fila_origen: Número de fila desde donde copiar estilos
-        fila_destino: Número de fila donde aplicar los estilos
-    """
-    # Define estilos base por si no se pueden obtener de la fila origen
-    fuente_base = Font(
-        name='Calibri',
-        size=11,
-        color='000000',
-        bold=False,
-        italic=False
-    )
-    
-    alineacion_base = Alignment(
-        horizontal='center',
-        vertical='center',
-        wrap_text=True
-    )
-    
-    relleno_base = PatternFill(
-        fill_type='solid',
-        fgColor='FFFFFF'
-    )
-    
-    borde_fino = Side(
-        style='thin',
-        color='000000'
-    )
-    
-    bordes_base = Border(
-        top=borde_fino,
-        bottom=borde_fino,
-        left=borde_fino,
-        right=borde_fino
+        wb: Libro de trabajo donde se asignarán los estilos
+    """
+    estilos = (
+        (ESTILO_FILA_DATOS, SIN_BORDES),
+        (ESTILO_FILA_MOTIVOS, BORDES_CELDA),
     )
+    for nombre, borde in estilos:
+        if nombre not in wb.named_styles:
+            wb.add_named_style(NamedStyle(name=nombre, font=FUENTE_FILA_DATOS, border=borde))
+
+def asegurar_anchos_columnas(ws: Worksheet) -> None:
+    """
+    Asigna un ancho por defecto a las columnas A-Q que no lo tengan definido.
     
-    # Obtiene altura de la fila origen o usa valor por defecto
-    altura_fila: float = ws.row_dimensions[fila_origen].height or 20.0
-    ws.row_dimensions[fila_destino].height = altura_fila
-    # Copia estilos celda por celda
-    for col in range(1, 18):  # A hasta Q
-        celda_origen = ws.cell(row=fila_origen, column=col)
-        celda_destino = ws.cell(row=fila_destino, column=col)
-        
-        # Crea una nueva celda con los estilos combinados
-        ws._cells[(fila_destino, col)] = Cell(
-            ws,
-            row=fila_destino,
-            column=col,
-            value=celda_destino.value
-        )
-        celda_destino = ws.cell(row=fila_destino, column=col)
-        
-        # Copia estilos individuales creando nuevos objetos
-        origen_font = celda_origen.font
-        celda_destino.font = Font(
-            name=origen_font.name,
-            size=origen_font.size,
-            bold=origen_font.bold,
-            italic=origen_font.italic,
-            color=origen_font.color
-        )
-        
-        origen_fill = celda_origen.fill
-        celda_destino.fill = PatternFill(
-            fill_type=origen_fill.fill_type,
-            start_color=origen_fill.start_color,
-            end_color=origen_fill.end_color
-        )
-        
-        origen_alignment = celda_origen.alignment
-        celda_destino.alignment = Alignment(
-            horizontal=origen_alignment.horizontal,
-            vertical=origen_alignment.vertical,
-            wrap_text=origen_alignment.wrap_text
-        )
-        
-        celda_destino.number_format = celda_origen.number_format
-        # Create new Border object from original or default
-        origen_border = celda_origen.border or bordes_base
-        celda_destino.border = Border(
-            left=origen_border.left,
-            right=origen_border.right,
-            top=origen_border.top,
-            bottom=origen_border.bottom
-        )
-        
-        # Establece ancho de columna si no está definido
-        letra_col = chr(64 + col)  # Convierte número a letra (1=A, 2=B, etc.)
-        if not ws.column_dimensions[letra_col].width:
-            ancho_origen = ws.column_dimensions[letra_col].width
-            ws.column_dimensions[letra_col].width = ancho_origen or 15.0
+    Args:
+        ws: Hoja de trabajo activa
+    """
+    dimensiones = ws.column_dimensions
+    for letra_col in LETRAS_COLUMNAS[COL_NRO:]:
+        if not dimensiones[letra_col].width:
+            dimensiones[letra_col].width = 15.0
 
 from typing import Union
 from openpyxl.cell.cell import MergedCell
 
 def aplicar_estilos_totales(celda: Union["Cell", "MergedCell"]) -> None:
     """Aplica estilos específicos a las celdas de totales."""
-    borde_fino = Side(style='thin', color='000000')
-    celda.fill = PatternFill(
-        fill_type='solid',
-        fgColor='D9D9D9'
-    )
-    celda.border = Border(
-        top=borde_fino,
-        bottom=borde_fino,
-        left=borde_fino,
-        right=borde_fino
-    )
-    celda.alignment = Alignment(
-        horizontal='center',
-        vertical='center',
-        wrap_text=True
-    )
+    celda.fill = RELLENO_TOTALES
+    celda.border = BORDES_FINOS
+    celda.alignment = ALINEACION_CENTRADA
 
 def aplicar_estilos_totales_motivos(celda: Union[Cell, MergedCell]) -> None:
     """
     Aplica estilos específicos a las celdas de totales de motivos.
     Sin color de fondo, solo bordes finos y alineación centrada.
     """
-    borde_fino = Side(style='thin', color='000000')
-    celda.border = Border(
-        top=borde_fino,
-        bottom=borde_fino,
-        left=borde_fino,
-        right=borde_fino
-    )
-    celda.alignment = Alignment(
-        horizontal='center',
-        vertical='center',
-        wrap_text=True
-    )
-    celda.font = Font(
-        name='Calibri',
-        size=11,
-        color='000000'
-    )
+    celda.border = BORDES_FINOS
+    celda.alignment = ALINEACION_CENTRADA
+    celda.font = FUENTE_TOTALES_MOTIVOS
 
 def aplicar_estilos_firma(ws: Worksheet, fila: int) -> None:
     """Aplica estilos específicos a la fila de firma."""
@@ -1,11 +1,15 @@
 from fastapi import FastAPI, HTTPException, Response
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 from pydantic import BaseModel
 import excel_utils
 import os
+from typing import Dict, List
 
-app = FastAPI()
+# Las respuestas JSON se serializan con orjson en lugar del json estándar
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Agrega este código después de crear la app
 app.add_middleware(
@@ -16,6 +20,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class GZipSinDescargas:
+    """
+    Aplica GZipMiddleware a las respuestas JSON grandes (listados, depuración),
+    pero deja fuera /descargar/: los .xlsx ya son ZIP, recomprimirlos apenas
+    reduce su tamaño, cuesta CPU y reemplaza Content-Length por chunked.
+    """
+    def __init__(self, app: ASGIApp, minimum_size: int = 1000) -> None:
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith("/descargar/"):
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+# Comprime las respuestas grandes si el cliente envía Accept-Encoding: gzip
+app.add_middleware(GZipSinDescargas, minimum_size=1000)
+
+class ExcelFileResponse(FileResponse):
+    """
+    FileResponse que envía el archivo en bloques de 1 MiB (el valor por defecto
+    de Starlette es 64 KiB), igual que el tamaño de bloque de descarga del cliente.
+    """
+    chunk_size = 1024 * 1024
+
 # Constante para la URL base
 BASE_URL = "http://127.0.0.1:8000"
 
@@ -36,14 +66,46 @@ def crear_archivo(request: CrearArchivoRequest):  # <-- Cambiado para recibir JS
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/audiencias/")
+@app.post("/audiencias/", status_code=204)
 def guardar_audiencia(audiencia: dict):  # Ajusta según tu modelo Pydantic
     try:
         excel_utils.guardar_una_audiencia_excel(audiencia, audiencia["nombre_archivo"])
-        return {"ok": True}
+        # Sin cuerpo: el 204 basta para indicar que se guardó
+        return Response(status_code=204)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/audiencias/bulk/")
+def guardar_audiencias(audiencias: List[dict]):
+    """
+    Guarda varias audiencias en una sola petición. Las agrupa por archivo para
+    leer y escribir cada Excel una única vez. Todos los grupos se validan antes
+    de escribir el primero: si alguno no es válido no se guarda ningún archivo.
+    """
+    try:
+        por_archivo: Dict[str, List[dict]] = {}
+        for audiencia in audiencias:
+            por_archivo.setdefault(audiencia["nombre_archivo"], []).append(audiencia)
+        preparados = [
+            (nombre_archivo, excel_utils.preparar_varias_audiencias_excel(grupo, nombre_archivo))
+            for nombre_archivo, grupo in por_archivo.items()
+        ]
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    guardados: List[str] = []
+    try:
+        for nombre_archivo, (wb, ws, grupo) in preparados:
+            excel_utils.escribir_varias_audiencias_excel(wb, ws, grupo, nombre_archivo)
+            guardados.append(nombre_archivo)
+    except Exception as e:
+        # Fallo al escribir (no de validación): se informa qué archivos sí quedaron guardados
+        raise HTTPException(
+            status_code=500,
+            detail={"error": str(e), "archivos_guardados": guardados}
+        )
+    return [{"ok": True} for _ in audiencias]
+
 @app.get("/archivos/")
 def listar():
     return excel_utils.listar_archivos()
@@ -88,16 +150,20 @@ def descargar_archivo(nombre_archivo: str):
     try:
         ruta_archivo = os.path.join(excel_utils.ARCHIVOS_DIR, nombre_archivo)
         
-        if not os.path.exists(ruta_archivo):
+        # Un solo stat: comprueba que exista y alimenta Content-Length/ETag
+        try:
+            stat_archivo = os.stat(ruta_archivo)
+        except FileNotFoundError:
             raise HTTPException(
                 status_code=404, 
                 detail=f"Archivo no encontrado: {nombre_archivo}"
             )
             
-        return FileResponse(
+        return ExcelFileResponse(
             ruta_archivo,
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            filename=nombre_archivo
+            filename=nombre_archivo,
+            stat_result=stat_archivo
         )
         
     except HTTPException:
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+from openpyxl import load_workbook
+
+import excel_utils
+
+pytest.importorskip("PIL")
+
+
+def _audiencia(radicado: str) -> dict:
+    return {
+        "radicado": radicado,
+        "tipo_audiencia": "Audiencia de imputación",
+        "fecha": "10/05/2024",
+        "hora": "09:30",
+        "juzgado": "Juzgado 1 Penal Municipal",
+        "se_realizo": "SI",
+    }
+
+
+def test_guardar_dos_veces_archivo_con_imagen(tmp_path, monkeypatch):
+    """
+    La plantilla trae el logo como imagen; guardar dos audiencias seguidas en el
+    mismo archivo no debe corromperlo.
+    """
+    monkeypatch.setattr(excel_utils, "ARCHIVOS_DIR", str(tmp_path))
+    ruta = excel_utils.crear_copia_plantilla("prueba")
+
+    excel_utils.guardar_una_audiencia_excel(_audiencia("11001600000020240001"), "prueba.xlsx")
+    excel_utils.guardar_una_audiencia_excel(_audiencia("11001600000020240002"), "prueba.xlsx")
+
+    wb = load_workbook(ruta)
+    ws = wb.active
+    assert ws._images
+    radicados = {
+        ws.cell(row=fila, column=excel_utils.COL_RADICADO).value
+        for fila in range(excel_utils.FILA_ENCABEZADO + 1, excel_utils.FILA_ENCABEZADO + 3)
+    }
+    wb.close()
+    assert radicados == {"11001600000020240001", "11001600000020240002"}
+    assert [n for n in os.listdir(tmp_path) if n.endswith(".tmp")] == []